@@ -16,22 +16,73 @@ KEY DIFFERENCES FROM STREAMLIT:
 # IMPORTS
 # ============================================
 from flask import Flask, jsonify, request, session
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from poker_engine import PokerGame
-from poker_coach import get_poker_advice
+import orjson
+from poker_engine import PokerGame, card_names
+from poker_coach import get_poker_advice_int
 import uuid
 from datetime import datetime
 import os
+import weakref
 from dotenv import load_dotenv
+from game_store import create_game_store
+
+try:
+    from gevent import get_hub
+    from gevent.monkey import is_module_patched
+except ImportError:  # gevent not installed (e.g. local dev server)
+    is_module_patched = None
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
 
 
+# ============================================
+# JSON ENCODING
+# ============================================
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider using orjson, so jsonify() encodes with orjson
+    Mirrors Flask's default provider: keys sorted, compact unless debugging
+    """
+    sort_keys = True
+    compact = None
+    mimetype = "application/json"
+
+    def _options(self, indent=None, sort_keys=None, **kwargs):
+        option = 0
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self._options(**kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def encode_response(self, obj) -> bytes:
+        """Body response() would send for obj"""
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return orjson.dumps(obj, option=self._options(indent=indent) | orjson.OPT_APPEND_NEWLINE)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode_response(obj), mimetype=self.mimetype)
+
+
 # ============================================
 # CREATE FLASK APP
 # ============================================
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Flask 3 equivalents of JSON_SORT_KEYS / JSONIFY_PRETTYPRINT_REGULAR = False:
+# keep keys in insertion order and never indent, even in debug mode
+app.json.sort_keys = False
+app.json.compact = True
 
 # IMPORTANT: Set secret key for sessions
 # In production, this comes from environment variable
@@ -47,33 +98,57 @@ def home():
 # ============================================
 # STORE ACTIVE GAMES
 # ============================================
-# In-memory storage (in production, use Redis or database)
+# Redis when REDIS_URL is set, in-memory otherwise (see game_store.py)
 # Key = game_id, Value = PokerGame instance
-active_games = {}
+# Routes that change a game must save it back with active_games.save()
+active_games = create_game_store()
 
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
-def get_position_name(game, player):
-    """Determine player position (UTG, MP, CO, BTN, SB, BB)"""
-    state = game.state
-    sb_seat, bb_seat = game.blind_seats()
-    
-    if player.seat == state.button_seat:
+def seat_position_name(seat, button_seat, sb_seat, bb_seat):
+    """Position of a seat given the button and blind seats"""
+    if seat == button_seat:
         return "BTN"
-    elif player.seat == sb_seat:
+    elif seat == sb_seat:
         return "SB"
-    elif player.seat == bb_seat:
+    elif seat == bb_seat:
         return "BB"
     return "MP"
 
 
+def run_blocking(func, *args, **kwargs):
+    """
+    Run CPU-heavy work (the coach's equity simulation) on a real OS thread
+    when served by gevent workers, so the worker keeps serving other
+    requests meanwhile; otherwise just call it
+    """
+    if is_module_patched is not None and is_module_patched("threading"):
+        return get_hub().threadpool.apply(func, args, kwargs)
+    return func(*args, **kwargs)
+
+
+def get_position_name(game, player):
+    """Determine player position (UTG, MP, CO, BTN, SB, BB)"""
+    sb_seat, bb_seat = game.blind_seats()
+    return seat_position_name(player.seat, game.state.button_seat, sb_seat, bb_seat)
+
+
+# Last serialized state per game: game -> (state_version, state dict)
+_serialized_states = weakref.WeakKeyDictionary()
+
+
 def serialize_game_state(game):
     """
     Convert game state to JSON-friendly format
     This is sent to the React frontend
+    The result is reused until the game changes, so don't modify it
     """
+    cached = _serialized_states.get(game)
+    if cached is not None and cached[0] == game.state_version:
+        return cached[1]
+    
     state = game.state
     hero = game.hero
     sb_seat, bb_seat = game.blind_seats()
@@ -92,17 +167,17 @@ def serialize_game_state(game):
             'contribution_this_round': p.contribution_this_round,
             'total_contribution': p.total_contribution,
             # Only show hole cards if it's the human player or at showdown
-            'hole_cards': p.hole_cards if (p.is_human or state.betting_round == "finished") else [],
-            'position': get_position_name(game, p),
+            'hole_cards': card_names(p.hole_cards) if (p.is_human or state.betting_round == "finished") else [],
+            'position': seat_position_name(p.seat, state.button_seat, sb_seat, bb_seat),
             'is_button': p.seat == state.button_seat,
             'is_sb': p.seat == sb_seat,
             'is_bb': p.seat == bb_seat
         })
     
     # Return complete game state as dictionary
-    return {
+    serialized = {
         'pot': state.pot,
-        'community_cards': state.community_cards,
+        'community_cards': card_names(state.community_cards),
         'betting_round': state.betting_round,
         'current_bet': state.current_bet,
         'button_seat': state.button_seat,
@@ -112,15 +187,39 @@ def serialize_game_state(game):
         'hero': {
             'seat': hero.seat,
             'stack': hero.stack,
-            'hole_cards': hero.hole_cards,
+            'hole_cards': card_names(hero.hole_cards),
             'in_hand': hero.in_hand,
             'has_folded': hero.has_folded,
-            'position': get_position_name(game, hero)
+            'position': seat_position_name(hero.seat, state.button_seat, sb_seat, bb_seat)
         },
         'last_event': game.last_event,
         'last_winner': game.last_winner,
         'total_chips': game.total_chips()
     }
+    _serialized_states[game] = (game.state_version, serialized)
+    return serialized
+
+
+# Encoded /state response body per game: game -> (state_version, JSON bytes)
+_state_responses = weakref.WeakKeyDictionary()
+
+
+def game_state_response(game):
+    """
+    serialize_game_state(game) as a JSON response
+    The encoded body is reused until the game changes, so polls between
+    actions don't re-encode anything
+    """
+    cached = _state_responses.get(game)
+    if cached is None or cached[0] != game.state_version:
+        body = app.json.encode_response(serialize_game_state(game))
+        cached = (game.state_version, body)
+        _state_responses[game] = cached
+    return app.response_class(cached[1], mimetype=app.json.mimetype)
+
+
+# Encoded /coach advice per game: game -> (state_version, JSON bytes)
+_advice_responses = weakref.WeakKeyDictionary()
 
 
 # ============================================
@@ -136,7 +235,7 @@ def health_check():
     """
     return jsonify({
         'status': 'healthy',
-        'active_games': len(active_games),
+        'active_games': active_games.count(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -172,8 +271,8 @@ def create_new_game():
     game = PokerGame(player_names=names, starting_stack=1000)
     game.start_new_hand()
     
-    # Store game in memory
-    active_games[game_id] = game
+    # Store game
+    active_games.save(game_id, game)
     
     # Return game ID and initial state to frontend
     return jsonify({
@@ -192,11 +291,11 @@ def get_game_state(game_id):
     RESPONSE: { ...game state... }
     """
     # Check if game exists
-    if game_id not in active_games:
+    game = active_games.get(game_id)
+    if game is None:
         return jsonify({'error': 'Game not found'}), 404
     
-    game = active_games[game_id]
-    return jsonify(serialize_game_state(game))
+    return game_state_response(game)
 
 
 @app.route('/api/game/<game_id>/action', methods=['POST'])
@@ -215,18 +314,22 @@ def player_action(game_id):
         "state": { ...updated game state... }
     }
     """
-    if game_id not in active_games:
+    game = active_games.get(game_id)
+    if game is None:
         return jsonify({'error': 'Game not found'}), 404
     
-    game = active_games[game_id]
     data = request.json
     
     # Get action details from request
     action = data.get('action')  # 'fold', 'check_call', 'bet_raise'
     amount = data.get('amount', None)
     
-    # Process the action using your poker engine
+    # Process the action using your poker engine. The bots' turns run
+    # inline rather than through run_blocking: they take well under a
+    # millisecond of pure Python that would hold the GIL on any thread, and
+    # the response has to carry the state after they have acted.
     game.run_street_with_human_choice(action, amount)
+    active_games.save(game_id, game)
     
     # Return updated state
     return jsonify({
@@ -247,11 +350,12 @@ def new_hand(game_id):
         "state": { ...new hand state... }
     }
     """
-    if game_id not in active_games:
+    game = active_games.get(game_id)
+    if game is None:
         return jsonify({'error': 'Game not found'}), 404
     
-    game = active_games[game_id]
     game.start_new_hand()
+    active_games.save(game_id, game)
     
     return jsonify({
         'success': True,
@@ -274,10 +378,19 @@ def get_coach_advice(game_id):
         ...
     }
     """
-    if game_id not in active_games:
+    game = active_games.get(game_id)
+    if game is None:
         return jsonify({'error': 'Game not found'}), 404
     
-    game = active_games[game_id]
+    # Asking again before anything changed: send the same advice without
+    # going back to the coach. Other requests for this game can run while
+    # the coach works, so the advice is cached under the version it was
+    # computed for, read up front.
+    version = game.state_version
+    cached = _advice_responses.get(game)
+    if cached is not None and cached[0] == version:
+        return app.response_class(cached[1], mimetype=app.json.mimetype)
+    
     hero = game.hero
     state = game.state
     
@@ -287,12 +400,15 @@ def get_coach_advice(game_id):
     
     # Get player position and count opponents
     hero_position = get_position_name(game, hero)
-    num_opponents = len([p for p in state.players if p.in_hand and not p.has_folded and not p.is_human])
+    num_opponents = state.num_active - 1  # everyone still in the hand but the hero
     
-    # Call your AI coach module
-    advice = get_poker_advice(
-        hero_hand=hero.hole_cards,
-        community_cards=state.community_cards,
+    # Call your AI coach module; engine cards are already the coach's
+    # card indices. The coach may run later on another thread: give it
+    # copies, not the engine's cards that the next street extends.
+    advice = run_blocking(
+        get_poker_advice_int,
+        hero_hand=bytes(hero.hole_cards),
+        community_cards=bytes(state.community_cards),
         pot=state.pot,
         current_bet=state.current_bet,
         hero_contribution=hero.contribution_this_round,
@@ -302,17 +418,11 @@ def get_coach_advice(game_id):
         num_opponents=num_opponents
     )
     
-    # Return advice as JSON
-    return jsonify({
-        'recommendation': advice.recommendation,
-        'reasoning': advice.reasoning,
-        'pot_odds': advice.pot_odds,
-        'equity_estimate': advice.equity_estimate,
-        'hand_strength': advice.hand_strength,
-        'outs': advice.outs,
-        'confidence': advice.confidence,
-        'alternative': advice.alternative
-    })
+    # Return advice as JSON; orjson encodes the CoachAdvice dataclass
+    # directly, one key per field
+    body = app.json.encode_response(advice)
+    _advice_responses[game] = (version, body)
+    return app.response_class(body, mimetype=app.json.mimetype)
 
 
 @app.route('/api/game/<game_id>/add-chips', methods=['POST'])
@@ -328,15 +438,17 @@ def add_chips(game_id):
         "new_stack": 1000
     }
     """
-    if game_id not in active_games:
+    game = active_games.get(game_id)
+    if game is None:
         return jsonify({'error': 'Game not found'}), 404
     
-    game = active_games[game_id]
     data = request.json
     amount = data.get('amount', 1000)
     
     # Add chips to hero's stack
     game.hero.stack += amount
+    game.mark_changed()
+    active_games.save(game_id, game)
     
     return jsonify({
         'success': True,
@@ -349,13 +461,21 @@ def add_chips(game_id):
 # ============================================
 
 if __name__ == '__main__':
-    # Get port from environment variable (for deployment)
+    # Flask's development server handles one request at a time: only use it
+    # when asked to, deployments run gunicorn (see gunicorn_conf.py)
+    if not os.environ.get('FLASK_DEV'):
+        raise SystemExit(
+            "Serve the app with gunicorn: gunicorn -c gunicorn_conf.py app:app\n"
+            "(set FLASK_DEV=1 to use Flask's development server instead)"
+        )
+
+    # Get port from environment variable
     # Default to 5000 for local development
     port = int(os.environ.get('PORT', 5000))
     
     # Run Flask server
-    # host='0.0.0.0' allows external connections (needed for deployment)
-    # debug=False for production (set to True for development)
+    # host='0.0.0.0' allows external connections
+    # debug=False by default (set to True for development)
     app.run(host='0.0.0.0', port=port, debug=False)
 
 
@@ -374,7 +494,8 @@ HOW TO USE THIS FILE:
 
 3. Test locally:
    cd backend
-   python app.py
+   FLASK_DEV=1 python app.py
+   (or, as deployed: gunicorn -c gunicorn_conf.py app:app)
    
    Then visit: http://localhost:5000/api/health
    Should see: {"status": "healthy", ...}
@@ -382,7 +503,8 @@ HOW TO USE THIS FILE:
 4. Deploy to Render/Railway:
    - Push to GitHub
    - Connect repo to Render/Railway
-   - They will automatically detect Python and run this file
+   - They will automatically detect Python and start gunicorn
+     (see render.yaml)
 
 ============================================
 WHAT CHANGED FROM STREAMLIT VERSION:
@@ -0,0 +1,110 @@
+"""
+Storage for active PokerGame instances, keyed by game id.
+
+Games are kept in Redis when REDIS_URL is set, so every gunicorn worker sees
+every game; otherwise in this process's memory. Either way a game is dropped
+after GAME_TTL_SECONDS without requests.
+"""
+
+import os
+import pickle
+import threading
+import time
+from typing import Optional
+
+from cachetools import LRUCache, TTLCache
+
+from poker_engine import PokerGame
+
+MAX_GAMES = 10000
+GAME_TTL_SECONDS = 3600
+
+
+class LocalGameStore:
+    """Games in process memory; only valid with a single worker"""
+
+    def __init__(self, maxsize: int = MAX_GAMES, ttl: int = GAME_TTL_SECONDS):
+        # TTLCache is not thread-safe: every access holds the lock
+        self._games = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, game_id: str) -> Optional[PokerGame]:
+        """Look up a game (None if unknown or expired) and reset its idle timer"""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is not None:
+                self._games[game_id] = game
+            return game
+
+    def save(self, game_id: str, game: PokerGame) -> None:
+        """Store a new or changed game"""
+        with self._lock:
+            self._games[game_id] = game
+
+    def count(self) -> int:
+        """Number of games that have not expired"""
+        with self._lock:
+            self._games.expire()
+            return len(self._games)
+
+
+class RedisGameStore:
+    """Games pickled in Redis, shared by all workers"""
+
+    # service:entity:id key schema
+    KEY_PREFIX = "game:state:"
+    # Sorted set of game ids scored by when they expire, so counting games
+    # doesn't have to scan the keyspace
+    EXPIRY_KEY = "game:expiry"
+
+    def __init__(self, url: str, ttl: int = GAME_TTL_SECONDS, local_size: int = 128):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+        # Recently used games of this worker with the blob they were loaded
+        # from or saved as. A game is only unpickled again when another
+        # worker has saved a different version since.
+        self._local = LRUCache(maxsize=local_size)
+        self._lock = threading.Lock()
+
+    def get(self, game_id: str) -> Optional[PokerGame]:
+        """Look up a game (None if unknown or expired) and reset its idle timer"""
+        blob = self._redis.getex(self.KEY_PREFIX + game_id, ex=self._ttl)
+        if blob is None:
+            # Expired: count() drops it, don't keep it alive here
+            return None
+        self._redis.zadd(self.EXPIRY_KEY, {game_id: time.time() + self._ttl})
+        with self._lock:
+            cached = self._local.get(game_id)
+        if cached is not None and cached[0] == blob:
+            return cached[1]
+        game = pickle.loads(blob)
+        with self._lock:
+            self._local[game_id] = (blob, game)
+        return game
+
+    def save(self, game_id: str, game: PokerGame) -> None:
+        """Store a new or changed game"""
+        blob = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.setex(self.KEY_PREFIX + game_id, self._ttl, blob)
+        pipe.zadd(self.EXPIRY_KEY, {game_id: time.time() + self._ttl})
+        pipe.execute()
+        with self._lock:
+            self._local[game_id] = (blob, game)
+
+    def count(self) -> int:
+        """Number of games that have not expired"""
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zremrangebyscore(self.EXPIRY_KEY, "-inf", time.time())
+        pipe.zcard(self.EXPIRY_KEY)
+        return pipe.execute()[1]
+
+
+def create_game_store():
+    """Redis-backed store when REDIS_URL is set, in-memory store otherwise"""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        return RedisGameStore(url)
+    return LocalGameStore()
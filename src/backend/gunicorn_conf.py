@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the Flask backend
+Run with: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+# gevent workers serve many requests concurrently per process, so slow
+# clients don't hold up coach or game requests
+worker_class = "gevent"
+worker_connections = 1000
+
+# With REDIS_URL set games are shared through Redis and any worker can serve
+# any game. Without it games live in one worker's memory (see game_store.py),
+# so every request for a game has to reach that worker: run only one.
+if os.environ.get("REDIS_URL"):
+    workers = 2 * multiprocessing.cpu_count() + 1
+else:
+    workers = 1
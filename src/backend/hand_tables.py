@@ -0,0 +1,211 @@
+"""
+Lookup tables for exact 5-7 card hand ranking.
+
+Hands are ranked like Cactus-Kev / deuces: 1 is a royal flush and 7462 is
+7-5-4-3-2 offsuit. A hand with five or more cards of one suit is ranked by
+FLUSH_RANK[mask of the ranks in that suit]; any other hand by
+unsuited_rank(product of the rank primes of all its cards).
+
+The tables ship as .npy files in tables/ (regenerate with
+`python hand_tables.py`) and are memory-mapped read-only, so all worker
+processes share one copy through the page cache. Without NumPy or the files
+they are built at import instead.
+"""
+
+import mmap
+import os
+from itertools import combinations, combinations_with_replacement
+from typing import Dict, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed: build the tables in Python
+    np = None
+
+RANKS = "23456789TJQKA"
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Hand categories, worst to best
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+CATEGORY_NAMES = (
+    "High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Quads", "Straight Flush",
+)
+
+NUM_RANKS = 7462
+
+
+def _keep_top(mask: int, k: int) -> int:
+    """Keep only the k highest set bits of mask"""
+    while mask.bit_count() > k:
+        mask &= mask - 1
+    return mask
+
+
+def _straight_top(mask: int) -> int:
+    """Rank bit of the highest straight's top card in mask (0 = no straight)"""
+    for hi in range(12, 3, -1):
+        pattern = 0x1F << (hi - 4)
+        if mask & pattern == pattern:
+            return 1 << hi
+    if mask & 0x100F == 0x100F:  # wheel, five high
+        return 1 << 3
+    return 0
+
+
+# A score orders hands like their rank does, higher is better:
+#   category << 26 | primary << 13 | kickers
+# where primary and kickers are rank masks.
+
+def _flush_score(mask: int) -> int:
+    top = _straight_top(mask)
+    if top:
+        return STRAIGHT_FLUSH << 26 | top << 13
+    return FLUSH << 26 | _keep_top(mask, 5) << 13
+
+
+def _unsuited_score(ranks: Iterable[int]) -> int:
+    """Score of the best 5 cards among ranks, ignoring flushes"""
+    singles = pairs = trips = quads = 0
+    for r in ranks:
+        bit = 1 << r
+        quads |= trips & bit
+        trips |= pairs & bit
+        pairs |= singles & bit
+        singles |= bit
+
+    if quads:
+        return QUADS << 26 | quads << 13 | _keep_top(singles & ~quads, 1)
+    if trips and pairs.bit_count() >= 2:
+        top = _keep_top(trips, 1)
+        return FULL_HOUSE << 26 | top << 13 | _keep_top(pairs & ~top, 1)
+    top = _straight_top(singles)
+    if top:
+        return STRAIGHT << 26 | top << 13
+    if trips:
+        return TRIPS << 26 | trips << 13 | _keep_top(singles & ~trips, 2)
+    if pairs.bit_count() >= 2:
+        top = _keep_top(pairs, 2)
+        return TWO_PAIR << 26 | top << 13 | _keep_top(singles & ~top, 1)
+    if pairs:
+        return PAIR << 26 | pairs << 13 | _keep_top(singles & ~pairs, 3)
+    return HIGH_CARD << 26 | _keep_top(singles, 5) << 13
+
+
+def _rank_multisets(n: int):
+    """Every multiset of n ranks with no rank more than 4 times"""
+    for ranks in combinations_with_replacement(range(13), n):
+        if all(ranks[i] != ranks[i + 4] for i in range(n - 4)):
+            yield ranks
+
+
+def _prime_product(ranks: Iterable[int]) -> int:
+    product = 1
+    for r in ranks:
+        product *= PRIMES[r]
+    return product
+
+
+def _build_tables():
+    # Number the 7462 distinct 5-card hands, best first
+    scores = {_flush_score(sum(1 << r for r in ranks)) for ranks in combinations(range(13), 5)}
+    scores.update(_unsuited_score(ranks) for ranks in _rank_multisets(5))
+    rank_of: Dict[int, int] = {score: i + 1 for i, score in enumerate(sorted(scores, reverse=True))}
+    assert len(rank_of) == NUM_RANKS
+
+    flush_rank = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if mask.bit_count() >= 5:
+            flush_rank[mask] = rank_of[_flush_score(mask)]
+
+    unsuited_rank: Dict[int, int] = {}
+    for n in (5, 6, 7):
+        for ranks in _rank_multisets(n):
+            unsuited_rank[_prime_product(ranks)] = rank_of[_unsuited_score(ranks)]
+
+    category = bytearray(NUM_RANKS + 1)
+    primary = bytearray(NUM_RANKS + 1)
+    for score, rank in rank_of.items():
+        category[rank] = score >> 26
+        primary[rank] = ((score >> 13) & 0x1FFF).bit_length() - 1
+
+    return flush_rank, unsuited_rank, category, primary
+
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+def _build_arrays():
+    """The tables as the NumPy arrays stored in TABLE_DIR, by file name"""
+    flush_rank, unsuited_rank, category, primary = _build_tables()
+    keys = sorted(unsuited_rank)
+    return {
+        "flush_rank": np.array(flush_rank, dtype=np.uint16),
+        "unsuited_keys": np.array(keys, dtype=np.int64),
+        "unsuited_ranks": np.array([unsuited_rank[k] for k in keys], dtype=np.uint16),
+        "rank_info": np.array([list(category), list(primary)], dtype=np.uint8),
+    }
+
+
+def _save_tables() -> None:
+    """Write the tables to TABLE_DIR as .npy files"""
+    os.makedirs(TABLE_DIR, exist_ok=True)
+    for name, table in _build_arrays().items():
+        np.save(os.path.join(TABLE_DIR, name + ".npy"), table)
+
+
+def _load_table(name: str):
+    table = np.load(os.path.join(TABLE_DIR, name + ".npy"), mmap_mode="r")
+    # Lookups hit random entries: don't let the kernel read ahead
+    mapping = getattr(table, "_mmap", None)
+    if mapping is not None and hasattr(mmap, "MADV_RANDOM"):
+        mapping.madvise(mmap.MADV_RANDOM)
+    return table
+
+
+def _load_tables():
+    """
+    Tables memory-mapped from TABLE_DIR, or built in memory if a file is
+    missing; None without NumPy
+    """
+    if np is None:
+        return None
+    try:
+        tables = {name: _load_table(name)
+                  for name in ("flush_rank", "unsuited_keys", "unsuited_ranks", "rank_info")}
+    except FileNotFoundError:
+        tables = _build_arrays()
+    rank_info = tables["rank_info"]
+    # The per-rank tables are tiny and read on every lookup: keep them in memory
+    return (tables["flush_rank"], tables["unsuited_keys"], tables["unsuited_ranks"],
+            bytearray(rank_info[0]), bytearray(rank_info[1]))
+
+
+# FLUSH_RANK: 8192 entries, by rank mask of the flush suit (0 = fewer than 5 ranks)
+# unsuited_rank(): prime product of 5-7 ranks -> rank
+# UNSUITED_KEYS, UNSUITED_RANKS: the table behind unsuited_rank(), sorted
+#   prime products and their ranks (NumPy arrays; only with NumPy)
+# RANK_CATEGORY: rank -> hand category
+# RANK_PRIMARY: rank -> index of the top rank of the hand's main part
+#   (quads, trips, top pair, straight high card or highest card)
+_tables = _load_tables()
+if _tables is not None:
+    FLUSH_RANK, UNSUITED_KEYS, UNSUITED_RANKS, RANK_CATEGORY, RANK_PRIMARY = _tables
+
+    def unsuited_rank(prime_product: int) -> int:
+        """Rank of the hand without a flush whose rank primes multiply to prime_product"""
+        i = UNSUITED_KEYS.searchsorted(prime_product)
+        # KeyError for a product of fewer than 5 or more than 7 ranks, like the dict
+        if i == len(UNSUITED_KEYS) or UNSUITED_KEYS[i] != prime_product:
+            raise KeyError(prime_product)
+        return int(UNSUITED_RANKS[i])
+else:
+    FLUSH_RANK, _UNSUITED_RANK, RANK_CATEGORY, RANK_PRIMARY = _build_tables()
+    unsuited_rank = _UNSUITED_RANK.__getitem__
+del _tables
+
+
+if __name__ == "__main__":
+    _save_tables()
+    print(f"Wrote hand tables to {TABLE_DIR}")
@@ -3,15 +3,177 @@ Advanced Poker Coach Module
 Provides strategic advice, pot odds, equity estimation, and position-aware recommendations.
 """
 
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Final, Iterable, Sequence
 from dataclasses import dataclass
-import random
+from functools import lru_cache
+from itertools import product
+
+from hand_tables import (
+    PRIMES, HIGH_CARD, PAIR, CATEGORY_NAMES,
+    FLUSH_RANK, RANK_CATEGORY, RANK_PRIMARY, unsuited_rank,
+)
+
+try:
+    from poker_coach_mc import estimate_equity
+except ImportError:  # NumPy not installed: fall back to the rule of 2 and 4
+    estimate_equity = None
 
 RANKS = "23456789TJQKA"
 SUITS = "shdc"
 
+# Internally a card is its index in DECK: rank << 2 | suit, 0..51
+DECK = [r + s for r in RANKS for s in SUITS]
+_CARD_IDX: Dict[str, int] = {c: i for i, c in enumerate(DECK)}
+
+# Cactus-Kev card encoding (one 32-bit int per card), by card index:
+#   xxxbbbbb bbbbbbbb shdcrrrr xxpppppp
+#   b = rank bit, s/h/d/c = suit bit, r = rank index, p = rank prime
+_CARD_INT: Tuple[int, ...] = tuple(
+    (1 << (16 + ri)) | (1 << (12 + si)) | (ri << 8) | PRIMES[ri]
+    for ri in range(len(RANKS))
+    for si in range(len(SUITS))
+)
+
+# Suit-count increment indexed by a card's 4 suit bits: one 4-bit counter per
+# suit packed into one int, so counting suits is a plain integer add
+_SUIT_COUNTER = tuple(
+    1 << (4 * (suit_bits.bit_length() - 1)) if suit_bits else 0 for suit_bits in range(16)
+)
+
+# 13-bit rank masks of every straight, wheel (A-2-3-4-5) included
+_STRAIGHT_MASKS = tuple(0x1F << i for i in range(9)) + (0x100F,)
+
+# _STRAIGHT[rank_mask] is 1 when the ranks in rank_mask contain a straight
+_STRAIGHT = bytearray(
+    any(mask & s == s for s in _STRAIGHT_MASKS) for mask in range(1 << 13)
+)
+
+
+def _completing_ranks(mask: int) -> int:
+    """How many ranks not in mask would complete a straight with it"""
+    if _STRAIGHT[mask]:
+        return 0
+    completing = 0
+    for straight in _STRAIGHT_MASKS:
+        missing = straight & ~mask
+        if missing & (missing - 1) == 0:  # exactly one rank missing
+            completing |= missing
+    return completing.bit_count()
+
+
+# Draw tables indexed by rank mask: two ranks completing a straight is an
+# open-ended (or double gutshot) draw, exactly one a gutshot
+_OESD = bytearray(1 << 13)
+_GUTSHOT = bytearray(1 << 13)
+for _mask in range(1 << 13):
+    _completing = _completing_ranks(_mask)
+    _OESD[_mask] = _completing >= 2
+    _GUTSHOT[_mask] = _completing == 1
+del _mask, _completing
+
+# Postflop strength per hand category; pairs and high cards scale by rank
+_CATEGORY_STRENGTH = (0.0, 0.0, 0.55, 0.65, 0.75, 0.8, 0.9, 0.95, 0.99)
+
+
+def _make_hand_code(card1: int, card2: int) -> str:
+    """Convert two cards to hand code like 'AKs', 'TT', '72o'"""
+    r1, s1 = card1 >> 2, card1 & 3
+    r2, s2 = card2 >> 2, card2 & 3
+
+    if r1 == r2:
+        return RANKS[r1] + RANKS[r2]
+
+    # Sort by rank
+    hi, lo = max(r1, r2), min(r1, r2)
+
+    suited = (s1 == s2)
+    return RANKS[hi] + RANKS[lo] + ("s" if suited else "o")
+
+
+def _make_preflop_strength(card1: int, card2: int) -> float:
+    """Estimate preflop hand strength (0-1)"""
+    i1, s1 = card1 >> 2, card1 & 3
+    i2, s2 = card2 >> 2, card2 & 3
+
+    # Base on high card
+    base = max(i1, i2) / (len(RANKS) - 1)
+
+    # Bonuses
+    if i1 == i2:  # Pocket pair
+        base += 0.35
+    if s1 == s2:  # Suited
+        base += 0.08
+    if abs(i1 - i2) <= 3:  # Connected
+        base += 0.05
+
+    # Both cards high
+    if i1 >= 8 and i2 >= 8:  # Both J or better
+        base += 0.1
+
+    return min(1.0, max(0.0, base))
 
-@dataclass
+
+# Preflop lookup tables. Every ordered pair of distinct cards maps to one of
+# the 169 starting hands, numbered 0..168; code and strength are per hand id.
+# _HAND_ID is a 52x52 table indexed by the card index of both cards.
+_HAND_CODES: List[str] = []
+_PREFLOP_STRENGTH: List[float] = []
+_HAND_ID: List[List[Optional[int]]] = [[None] * len(DECK) for _ in DECK]
+_CODE_TO_ID: Dict[str, int] = {}
+
+for _c1, _c2 in product(range(len(DECK)), repeat=2):
+    if _c1 == _c2:
+        continue
+    _code = _make_hand_code(_c1, _c2)
+    if _code not in _CODE_TO_ID:
+        _CODE_TO_ID[_code] = len(_HAND_CODES)
+        _HAND_CODES.append(_code)
+        _PREFLOP_STRENGTH.append(_make_preflop_strength(_c1, _c2))
+    _HAND_ID[_c1][_c2] = _CODE_TO_ID[_code]
+del _c1, _c2, _code
+
+
+def _hand_ids(*codes: str) -> frozenset:
+    """Frozenset of hand ids for the given hand codes"""
+    return frozenset(_CODE_TO_ID[code] for code in codes)
+
+
+_PREMIUM_HANDS = _hand_ids("AA", "KK", "QQ", "AKs", "AKo")
+_STRONG_HANDS = _hand_ids("JJ", "TT", "AQs", "AQo", "KQs")
+
+# Position-based opening ranges (simplified)
+_PREFLOP_RANGES: Final[Dict[str, frozenset]] = {
+    "UTG": _hand_ids(  # Under the gun - tightest
+        "AA", "KK", "QQ", "JJ", "TT", "99",
+        "AKs", "AQs", "AJs", "AKo", "AQo"
+    ),
+    "MP": _hand_ids(  # Middle position
+        "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77",
+        "AKs", "AQs", "AJs", "ATs", "KQs", "KJs", "QJs",
+        "AKo", "AQo", "AJo", "KQo"
+    ),
+    "CO": _hand_ids(  # Cutoff - wider
+        "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55",
+        "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A5s", "A4s", "A3s", "A2s",
+        "KQs", "KJs", "KTs", "QJs", "QTs", "JTs", "T9s", "98s",
+        "AKo", "AQo", "AJo", "ATo", "KQo", "KJo", "QJo"
+    ),
+    "BTN": _hand_ids(  # Button - widest
+        "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55", "44", "33", "22",
+        "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A7s", "A6s", "A5s", "A4s", "A3s", "A2s",
+        "KQs", "KJs", "KTs", "K9s", "QJs", "QTs", "Q9s", "JTs", "J9s", "T9s", "T8s", "98s", "87s", "76s",
+        "AKo", "AQo", "AJo", "ATo", "A9o", "KQo", "KJo", "KTo", "QJo", "QTo", "JTo"
+    ),
+    "SB": _hand_ids(  # Small blind vs BB
+        "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55", "44", "33", "22",
+        "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A7s", "A6s", "A5s", "A4s", "A3s", "A2s",
+        "KQs", "KJs", "KTs", "K9s", "K8s", "QJs", "QTs", "Q9s", "JTs", "J9s", "T9s", "T8s", "98s", "87s",
+        "AKo", "AQo", "AJo", "ATo", "A9o", "A8o", "KQo", "KJo", "KTo", "QJo"
+    )
+}
+
+
+@dataclass(frozen=True, slots=True)
 class CoachAdvice:
     """Structured coaching advice"""
     recommendation: str  # "fold", "check", "call", "bet", "raise"
@@ -28,40 +190,9 @@ class PokerCoach:
     """Advanced poker coaching system"""
     
     def __init__(self):
-        # Position-based preflop ranges (simplified)
-        self.preflop_ranges = self._build_preflop_ranges()
-    
-    def _build_preflop_ranges(self) -> Dict[str, set]:
-        """Build position-based opening ranges"""
-        return {
-            "UTG": {  # Under the gun - tightest
-                "AA", "KK", "QQ", "JJ", "TT", "99",
-                "AKs", "AQs", "AJs", "AKo", "AQo"
-            },
-            "MP": {  # Middle position
-                "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77",
-                "AKs", "AQs", "AJs", "ATs", "KQs", "KJs", "QJs",
-                "AKo", "AQo", "AJo", "KQo"
-            },
-            "CO": {  # Cutoff - wider
-                "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55",
-                "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A5s", "A4s", "A3s", "A2s",
-                "KQs", "KJs", "KTs", "QJs", "QTs", "JTs", "T9s", "98s",
-                "AKo", "AQo", "AJo", "ATo", "KQo", "KJo", "QJo"
-            },
-            "BTN": {  # Button - widest
-                "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55", "44", "33", "22",
-                "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A7s", "A6s", "A5s", "A4s", "A3s", "A2s",
-                "KQs", "KJs", "KTs", "K9s", "QJs", "QTs", "Q9s", "JTs", "J9s", "T9s", "T8s", "98s", "87s", "76s",
-                "AKo", "AQo", "AJo", "ATo", "A9o", "KQo", "KJo", "KTo", "QJo", "QTo", "JTo"
-            },
-            "SB": {  # Small blind vs BB
-                "AA", "KK", "QQ", "JJ", "TT", "99", "88", "77", "66", "55", "44", "33", "22",
-                "AKs", "AQs", "AJs", "ATs", "A9s", "A8s", "A7s", "A6s", "A5s", "A4s", "A3s", "A2s",
-                "KQs", "KJs", "KTs", "K9s", "K8s", "QJs", "QTs", "Q9s", "JTs", "J9s", "T9s", "T8s", "98s", "87s",
-                "AKo", "AQo", "AJo", "ATo", "A9o", "A8o", "KQo", "KJo", "KTo", "QJo"
-            }
-        }
+        # Per coach rather than @lru_cache on the method, which would keep
+        # every coach alive in one cache shared by the class
+        self._cached_advice = lru_cache(maxsize=4096)(self._advice)
     
     def get_advice(self, hero_hand: List[str], community_cards: List[str],
                    pot: int, current_bet: int, hero_contribution: int,
@@ -81,7 +212,29 @@ class PokerCoach:
             street: "preflop", "flop", "turn", "river"
             num_opponents: Number of active opponents
         """
-        
+        return self.get_advice_int(parse_cards(hero_hand), parse_cards(community_cards),
+                                   pot, current_bet, hero_contribution, hero_stack,
+                                   position, street, num_opponents)
+    
+    def get_advice_int(self, hero_hand: Sequence[int], community_cards: Sequence[int],
+                       pot: int, current_bet: int, hero_contribution: int,
+                       hero_stack: int, position: str, street: str,
+                       num_opponents: int) -> CoachAdvice:
+        """
+        Same as get_advice, with cards already parsed to card indices
+        (see parse_cards)
+        """
+        # Advice is a pure function of the situation: normalize card order
+        # so equivalent situations share one cache entry
+        return self._cached_advice(tuple(sorted(hero_hand)), tuple(sorted(community_cards)),
+                                   pot, current_bet, hero_contribution, hero_stack,
+                                   position, street, num_opponents)
+    
+    def _advice(self, hero_hand: Tuple[int, ...], community_cards: Tuple[int, ...],
+                pot: int, current_bet: int, hero_contribution: int,
+                hero_stack: int, position: str, street: str,
+                num_opponents: int) -> CoachAdvice:
+        """Body of get_advice, cached per coach; takes sorted card tuples"""
         if street == "preflop":
             return self._preflop_advice(hero_hand, pot, current_bet, hero_contribution,
                                        hero_stack, position, num_opponents)
@@ -90,7 +243,7 @@ class PokerCoach:
                                         hero_contribution, hero_stack, position, street,
                                         num_opponents)
     
-    def _preflop_advice(self, hero_hand: List[str], pot: int, current_bet: int,
+    def _preflop_advice(self, hero_hand: Tuple[int, ...], pot: int, current_bet: int,
                        hero_contribution: int, hero_stack: int, position: str,
                        num_opponents: int) -> CoachAdvice:
         """Preflop strategy advice"""
@@ -98,21 +251,22 @@ class PokerCoach:
         if len(hero_hand) != 2:
             return CoachAdvice("fold", "Invalid hand", confidence="high")
         
-        hand_code = self._hand_to_code(hero_hand[0], hero_hand[1])
+        hand_id = _HAND_ID[hero_hand[0]][hero_hand[1]]
+        hand_code = _HAND_CODES[hand_id]
         to_call = current_bet - hero_contribution
         
         # Get position range
-        pos_range = self.preflop_ranges.get(position, self.preflop_ranges["MP"])
+        pos_range = _PREFLOP_RANGES.get(position, _PREFLOP_RANGES["MP"])
         
         # Basic hand strength
-        strength = self._preflop_hand_strength(hero_hand)
+        strength = _PREFLOP_STRENGTH[hand_id]
         
         # Facing a raise?
         facing_raise = to_call > 0 and current_bet > pot * 0.1
         
         if facing_raise:
             # Tighten up when facing aggression
-            if hand_code in ["AA", "KK", "QQ", "AKs", "AKo"]:
+            if hand_id in _PREMIUM_HANDS:
                 return CoachAdvice(
                     "raise",
                     f"Premium hand ({hand_code}). 3-bet for value. You have ~{int(strength*100)}% equity advantage.",
@@ -121,7 +275,7 @@ class PokerCoach:
                     confidence="high",
                     alternative="Call to trap occasionally with AA/KK"
                 )
-            elif hand_code in ["JJ", "TT", "AQs", "AQo", "KQs"]:
+            elif hand_id in _STRONG_HANDS:
                 pot_odds = to_call / (pot + to_call) if pot + to_call > 0 else 0
                 return CoachAdvice(
                     "call",
@@ -159,7 +313,7 @@ class PokerCoach:
         
         # Unopened pot - should we open?
         elif to_call == 0:
-            if hand_code in pos_range:
+            if hand_id in pos_range:
                 bet_size = max(pot * 2.5, hero_stack * 0.15)
                 return CoachAdvice(
                     "bet",
@@ -195,12 +349,17 @@ class PokerCoach:
                     confidence="medium"
                 )
     
-    def _postflop_advice(self, hero_hand: List[str], community_cards: List[str],
+    def _postflop_advice(self, hero_hand: Tuple[int, ...], community_cards: Tuple[int, ...],
                         pot: int, current_bet: int, hero_contribution: int,
                         hero_stack: int, position: str, street: str,
                         num_opponents: int) -> CoachAdvice:
         """Postflop strategy advice"""
         
+        # The hand tables only rank 5-7 cards; a hero who was all-in on the
+        # blind is dealt no hole cards
+        if len(hero_hand) != 2 or len(community_cards) < 3:
+            return CoachAdvice("fold", "Invalid hand", confidence="high")
+        
         to_call = current_bet - hero_contribution
         
         # Analyze hand strength
@@ -213,9 +372,11 @@ class PokerCoach:
         # Calculate pot odds if facing bet
         pot_odds = to_call / (pot + to_call) if (pot + to_call > 0 and to_call > 0) else 0
         
-        # Calculate implied odds based on remaining cards
-        cards_to_come = 2 if street == "flop" else 1
-        win_probability = self._outs_to_probability(outs, cards_to_come)
+        # Equity is only needed to price draws
+        win_probability = 0.0
+        if draw_type:
+            win_probability = self._estimate_equity(hero_hand, community_cards, street,
+                                                    outs, num_opponents)
         
         # No bet to call - check or bet?
         if to_call == 0:
@@ -254,7 +415,7 @@ class PokerCoach:
                     hand_strength=draw_type,
                     outs=outs,
                     confidence="medium",
-                    alternative=f"You improve on ~{win_probability:.1%} of run-outs"
+                    alternative=f"Estimated equity: ~{win_probability:.1%}"
                 )
             else:
                 return CoachAdvice(
@@ -312,7 +473,7 @@ class PokerCoach:
                 if pot_odds < win_probability:
                     return CoachAdvice(
                         "call",
-                        f"Strong {draw_type} (~{outs} outs, {win_probability:.1%} to improve). Pot odds {pot_odds:.1%} < equity {win_probability:.1%}. Profitable call!",
+                        f"Strong {draw_type} (~{outs} outs, {win_probability:.1%} equity). Pot odds {pot_odds:.1%} < equity {win_probability:.1%}. Profitable call!",
                         pot_odds=pot_odds,
                         equity_estimate=win_probability,
                         hand_strength=draw_type,
@@ -359,111 +520,67 @@ class PokerCoach:
                         confidence="high"
                     )
     
-    def _preflop_hand_strength(self, hand: List[str]) -> float:
-        """Estimate preflop hand strength (0-1)"""
-        if len(hand) != 2:
-            return 0.0
-        
-        c1, c2 = hand
-        r1, s1 = c1[0], c1[1]
-        r2, s2 = c2[0], c2[1]
-        
-        i1 = RANKS.index(r1)
-        i2 = RANKS.index(r2)
-        
-        # Base on high card
-        base = max(i1, i2) / (len(RANKS) - 1)
-        
-        # Bonuses
-        if r1 == r2:  # Pocket pair
-            base += 0.35
-        if s1 == s2:  # Suited
-            base += 0.08
-        if abs(i1 - i2) <= 3:  # Connected
-            base += 0.05
-        
-        # Both cards high
-        if i1 >= 8 and i2 >= 8:  # Both J or better
-            base += 0.1
-        
-        return min(1.0, max(0.0, base))
-    
-    def _analyze_postflop_hand(self, hero_hand: List[str], 
-                               community_cards: List[str]) -> Dict:
+    def _analyze_postflop_hand(self, hero_hand: Sequence[int], 
+                               community_cards: Sequence[int]) -> Dict:
         """Analyze postflop hand strength"""
         
-        all_cards = hero_hand + community_cards
-        
-        # Count ranks and suits
-        rank_counts = {}
-        suit_counts = {}
-        ranks = []
-        
-        for card in all_cards:
-            r, s = card[0], card[1]
-            rank_counts[r] = rank_counts.get(r, 0) + 1
-            suit_counts[s] = suit_counts.get(s, 0) + 1
-            ranks.append(RANKS.index(r))
-        
-        ranks.sort(reverse=True)
-        
-        # Check for made hands
-        max_same_rank = max(rank_counts.values()) if rank_counts else 0
-        max_same_suit = max(suit_counts.values()) if suit_counts else 0
-        
-        # Simple hand detection
-        made_hand = None
-        strength = 0.0
-        
-        if max_same_rank == 4:
-            made_hand = "Quads"
-            strength = 0.95
-        elif max_same_rank == 3:
-            if len([v for v in rank_counts.values() if v >= 2]) >= 2:
-                made_hand = "Full House"
-                strength = 0.9
-            else:
-                made_hand = "Three of a Kind"
-                strength = 0.65
-        elif max_same_suit >= 5:
-            made_hand = "Flush"
-            strength = 0.8
-        elif self._has_straight(ranks):
-            made_hand = "Straight"
-            strength = 0.75
-        elif len([v for v in rank_counts.values() if v == 2]) >= 2:
-            made_hand = "Two Pair"
-            strength = 0.55
-        elif max_same_rank == 2:
-            made_hand = "Pair"
+        cards = [_CARD_INT[c] for c in (*hero_hand, *community_cards)]
+
+        # Suits are counted in one int, see _SUIT_COUNTER
+        rank_mask = suit_counts = 0
+        prime_product = 1
+
+        for c in cards:
+            rank_mask |= c
+            suit_counts += _SUIT_COUNTER[(c >> 12) & 0xF]
+            prime_product *= c & 0xFF
+        rank_mask >>= 16
+
+        # A counter holds at most 7, so adding 3 (or 4) sets its top bit
+        # exactly when that suit has 5+ (or 4+) cards
+        has_flush = (suit_counts + 0x3333) & 0x8888
+        has_four_flush = (suit_counts + 0x4444) & 0x8888
+
+        # Exact hand rank (1 = royal flush .. 7462) in one table lookup
+        if has_flush:
+            suit_bit = 1 << (12 + (has_flush.bit_length() - 1) // 4)
+            flush_mask = 0
+            for c in cards:
+                if c & suit_bit:
+                    flush_mask |= c
+            rank = FLUSH_RANK[flush_mask >> 16]
+        else:
+            rank = unsuited_rank(prime_product)
+
+        category = RANK_CATEGORY[rank]
+        made_hand = CATEGORY_NAMES[category]
+        if category == PAIR:
             # Strength depends on pair rank
-            for r, count in rank_counts.items():
-                if count == 2:
-                    pair_rank = RANKS.index(r)
-                    strength = 0.25 + (pair_rank / len(RANKS)) * 0.25
+            strength = 0.25 + (RANK_PRIMARY[rank] / len(RANKS)) * 0.25
+        elif category == HIGH_CARD:
+            strength = RANK_PRIMARY[rank] / len(RANKS) * 0.2
         else:
-            made_hand = "High Card"
-            strength = ranks[0] / len(RANKS) * 0.2
-        
+            strength = _CATEGORY_STRENGTH[category]
+
         # Check for draws
         draw_type = None
         outs = 0
-        
+
         # Flush draw
-        if max_same_suit == 4:
+        if has_four_flush and not has_flush:
             draw_type = "Flush Draw"
             outs = 9
         
-        # Straight draw (simplified)
-        if not made_hand or made_hand in ["Pair", "High Card"]:
-            if self._has_open_ended_straight_draw(ranks):
+        # Straight draw
+        if category <= PAIR:
+            if _OESD[rank_mask]:
                 if draw_type:
                     draw_type = "Combo Draw (Flush + Straight)"
                     outs = 15
                 else:
                     draw_type = "Open-Ended Straight Draw"
                     outs = 8
-            elif self._has_gutshot_draw(ranks):
+            elif _GUTSHOT[rank_mask]:
                 if draw_type:
                     draw_type = "Flush Draw + Gutshot"
                     outs = 12
@@ -478,42 +595,13 @@ class PokerCoach:
             "outs": outs
         }
     
-    def _has_straight(self, ranks: List[int]) -> bool:
-        """Check if ranks contain a straight"""
-        unique_ranks = sorted(set(ranks), reverse=True)
-        
-        # Check for wheel (A-2-3-4-5)
-        if set([12, 0, 1, 2, 3]).issubset(set(unique_ranks)):
-            return True
-        
-        # Check for regular straights
-        for i in range(len(unique_ranks) - 4):
-            if unique_ranks[i] - unique_ranks[i+4] == 4:
-                return True
-        
-        return False
-    
-    def _has_open_ended_straight_draw(self, ranks: List[int]) -> bool:
-        """Check for open-ended straight draw"""
-        unique_ranks = sorted(set(ranks), reverse=True)
-        
-        for i in range(len(unique_ranks) - 3):
-            if unique_ranks[i] - unique_ranks[i+3] == 3:
-                return True
-        
-        return False
-    
-    def _has_gutshot_draw(self, ranks: List[int]) -> bool:
-        """Check for gutshot straight draw (simplified)"""
-        unique_ranks = sorted(set(ranks), reverse=True)
-        
-        # Very simplified - just check for 4-card sequences with one gap
-        for i in range(len(unique_ranks) - 3):
-            span = unique_ranks[i] - unique_ranks[i+3]
-            if span == 4:  # e.g., 10-9-7-6 (missing 8)
-                return True
-        
-        return False
+    def _estimate_equity(self, hero_hand: Sequence[int], community_cards: Sequence[int],
+                         street: str, outs: int, num_opponents: int) -> float:
+        """Monte-Carlo equity vs random hands, or the rule of 2/4 on outs"""
+        if estimate_equity is None:
+            cards_to_come = 2 if street == "flop" else 1
+            return self._outs_to_probability(outs, cards_to_come)
+        return estimate_equity(hero_hand, community_cards, max(1, min(num_opponents, 7)))
     
     def _outs_to_probability(self, outs: int, cards_to_come: int) -> float:
         """Convert outs to win probability"""
@@ -524,25 +612,15 @@ class PokerCoach:
             # Turn to river (rule of 2)
             return min(1.0, outs * 2 / 100)
         return 0.0
-    
-    def _hand_to_code(self, card1: str, card2: str) -> str:
-        """Convert two cards to hand code like 'AKs', 'TT', '72o'"""
-        r1, s1 = card1[0], card1[1]
-        r2, s2 = card2[0], card2[1]
-        
-        if r1 == r2:
-            return r1 + r2
-        
-        # Sort by rank
-        if RANKS.index(r1) > RANKS.index(r2):
-            hi, lo = r1, r2
-            s_hi, s_lo = s1, s2
-        else:
-            hi, lo = r2, r1
-            s_hi, s_lo = s2, s1
-        
-        suited = (s_hi == s_lo)
-        return hi + lo + ("s" if suited else "o")
+
+
+def parse_cards(cards: Iterable[str]) -> List[int]:
+    """Convert cards like ['Ah', 'Kd'] to card indices (position in DECK)"""
+    return [_CARD_IDX[c] for c in cards]
+
+
+# Shared coach instance; PokerCoach holds no per-request state
+_COACH = PokerCoach()
 
 
 # Convenience function for easy import
@@ -568,7 +646,16 @@ def get_poker_advice(hero_hand: List[str], community_cards: List[str],
         print(advice.recommendation)  # "raise"
         print(advice.reasoning)  # Full explanation
     """
-    coach = PokerCoach()
-    return coach.get_advice(hero_hand, community_cards, pot, current_bet,
-                           hero_contribution, hero_stack, position, street,
-                           num_opponents)
\ No newline at end of file
+    return _COACH.get_advice(hero_hand, community_cards, pot, current_bet,
+                             hero_contribution, hero_stack, position, street,
+                             num_opponents)
+
+
+def get_poker_advice_int(hero_hand: Sequence[int], community_cards: Sequence[int],
+                         pot: int, current_bet: int, hero_contribution: int,
+                         hero_stack: int, position: str, street: str,
+                         num_opponents: int) -> CoachAdvice:
+    """Same as get_poker_advice, with cards already converted by parse_cards"""
+    return _COACH.get_advice_int(hero_hand, community_cards, pot, current_bet,
+                                 hero_contribution, hero_stack, position, street,
+                                 num_opponents)
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Monte-Carlo equity estimation for the poker coach.
+Deals random run-outs and opponent hands, ranks every 7-card hand with the
+hand_tables lookup tables and reports hero's share of the pot (wins + split
+ties). Uses Numba-compiled kernels when Numba is installed, otherwise ranks
+all samples at once with vectorized NumPy. The Numba kernels release the GIL,
+so simulations on different threads run in parallel.
+
+Cards are ints 0..51 with rank = card >> 2 and suit = card & 3, i.e. the
+index of the card in poker_coach.DECK.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from hand_tables import FLUSH_RANK, NUM_RANKS, PRIMES, UNSUITED_KEYS, UNSUITED_RANKS
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional; the NumPy kernels below are used instead
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+DEFAULT_SAMPLES = 1000
+
+# Passed to the kernels rather than read as globals, which Numba would copy
+# into the compiled code; np.asarray turns the memmaps into plain arrays
+# over the same memory
+_TABLES = (np.asarray(FLUSH_RANK), np.asarray(UNSUITED_KEYS), np.asarray(UNSUITED_RANKS))
+_PRIMES = np.array(PRIMES, dtype=np.int64)
+
+
+# ---------- Numba kernels ----------
+
+@njit(cache=True, nogil=True)
+def eval7(cards, tables):
+    """
+    Rank of the best 5-card hand among 5-7 cards, as in hand_tables:
+    1 (royal flush) to 7462; lower is better.
+    """
+    flush_rank, unsuited_keys, unsuited_ranks = tables
+    suited = np.zeros(4, dtype=np.int64)
+    product = 1
+    for c in cards:
+        suited[c & 3] |= 1 << (c >> 2)
+        product *= _PRIMES[c >> 2]
+
+    for s in range(4):
+        # Nonzero only for 5+ ranks in the suit
+        rank = flush_rank[suited[s]]
+        if rank:
+            return rank
+    return unsuited_ranks[np.searchsorted(unsuited_keys, product)]
+
+
+@njit(cache=True, nogil=True)
+def _deal(deck, n):
+    """Move n random cards to the front of deck (partial Fisher-Yates)"""
+    for i in range(n):
+        j = np.random.randint(i, len(deck))
+        deck[i], deck[j] = deck[j], deck[i]
+
+
+@njit(cache=True, nogil=True)
+def _equity(hero, board, num_opponents, n_samples, seed, tables):
+    if seed >= 0:
+        np.random.seed(seed)
+
+    known = np.zeros(52, dtype=np.bool_)
+    for c in hero:
+        known[c] = True
+    for c in board:
+        known[c] = True
+    deck = np.empty(52 - len(hero) - len(board), dtype=np.int64)
+    k = 0
+    for c in range(52):
+        if not known[c]:
+            deck[k] = c
+            k += 1
+
+    missing = 5 - len(board)
+    hand = np.empty(7, dtype=np.int64)
+    for i in range(len(board)):
+        hand[2 + i] = board[i]
+
+    share = 0.0
+    for _ in range(n_samples):
+        _deal(deck, missing + 2 * num_opponents)
+        for i in range(missing):
+            hand[7 - missing + i] = deck[i]
+
+        hand[0] = hero[0]
+        hand[1] = hero[1]
+        hero_rank = eval7(hand, tables)
+
+        best = NUM_RANKS + 1
+        ties = 0
+        for o in range(num_opponents):
+            hand[0] = deck[missing + 2 * o]
+            hand[1] = deck[missing + 2 * o + 1]
+            rank = eval7(hand, tables)
+            if rank < best:
+                best = rank
+                ties = 0
+            if rank == best:
+                ties += 1
+
+        if hero_rank < best:
+            share += 1.0
+        elif hero_rank == best:
+            share += 1.0 / (ties + 1)
+
+    return share / n_samples
+
+
+if HAVE_NUMBA:
+    # Compile (or load from the cache) now, on the importing thread. Compiling
+    # lazily from several threads at once deadlocks under gevent, whose
+    # patched locks can't be shared between the threads running kernels.
+    _equity(np.array([0, 1], dtype=np.int64), np.empty(0, dtype=np.int64), 1, 1, -1, _TABLES)
+
+
+# ---------- Vectorized NumPy kernels ----------
+
+def _eval7_batch(cards: np.ndarray) -> np.ndarray:
+    """eval7 over an (n, 7) array of card ints, one rank per row"""
+    flush_rank, unsuited_keys, unsuited_ranks = _TABLES
+    ranks = cards >> 2
+    suits = cards & 3
+    # Rank mask of each suit per row; at most one suit can hold 5+ of 7 cards
+    suited = ((1 << ranks)[:, :, None] * (suits[:, :, None] == np.arange(4))).sum(axis=1)
+    flush = flush_rank[suited].max(axis=1)
+    unsuited = unsuited_ranks[np.searchsorted(unsuited_keys, _PRIMES[ranks].prod(axis=1))]
+    return np.where(flush > 0, flush, unsuited)
+
+
+def _equity_numpy(hero: np.ndarray, board: np.ndarray, num_opponents: int,
+                  n_samples: int, seed: int) -> float:
+    rng = np.random.default_rng(seed if seed >= 0 else None)
+    deck = np.setdiff1d(np.arange(52, dtype=np.int64), np.concatenate([hero, board]))
+    missing = 5 - len(board)
+
+    # One shuffled deck per sample: run-out first, then opponents' hole cards
+    dealt = rng.permuted(np.tile(deck, (n_samples, 1)), axis=1)
+    boards = np.hstack([np.broadcast_to(board, (n_samples, len(board))), dealt[:, :missing]])
+    holes = dealt[:, missing:missing + 2 * num_opponents].reshape(n_samples, num_opponents, 2)
+
+    hero_ranks = _eval7_batch(np.hstack([np.broadcast_to(hero, (n_samples, 2)), boards]))
+    opp_cards = np.concatenate(
+        [holes, np.broadcast_to(boards[:, None, :], (n_samples, num_opponents, 5))], axis=2)
+    opp_ranks = _eval7_batch(opp_cards.reshape(-1, 7)).reshape(n_samples, num_opponents)
+
+    best = opp_ranks.min(axis=1)
+    ties = (opp_ranks == best[:, None]).sum(axis=1)
+    share = np.where(hero_ranks < best, 1.0,
+                     np.where(hero_ranks == best, 1.0 / (ties + 1), 0.0))
+    return float(share.mean())
+
+
+def estimate_equity(hero: Sequence[int], board: Sequence[int], num_opponents: int,
+                    n_samples: int = DEFAULT_SAMPLES, seed: int = -1) -> float:
+    """
+    Estimate hero's equity (0-1) against random opponent hands.
+
+    Args:
+        hero: Hero's 2 hole cards as card ints
+        board: 0-5 community cards as card ints
+        num_opponents: Opponents still in the hand (1-7)
+        n_samples: Number of simulated run-outs
+        seed: Seed for reproducible results; negative = unseeded
+    """
+    # The Numba kernel doesn't bounds-check: reject what it can't deal with
+    if len(hero) != 2 or len(board) > 5:
+        raise ValueError(f"Need 2 hole cards and at most 5 board cards, got {len(hero)} and {len(board)}")
+    hero = np.asarray(hero, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64)
+    if HAVE_NUMBA:
+        return _equity(hero, board, num_opponents, n_samples, seed, _TABLES)
+    return _equity_numpy(hero, board, num_opponents, n_samples, seed)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, List, NamedTuple, Optional, Dict, Tuple
 import random
 
 # ---------- Cards & Deck ----------
@@ -8,22 +8,70 @@ import random
 RANKS = "23456789TJQKA"
 SUITS = "shdc"  # spades, hearts, diamonds, clubs
 
+# Cards are ints 0..51: rank index << 2 | suit index (same order as
+# poker_coach.DECK). _CARD_STR[card] is its name, e.g. "Ah".
+_CARD_STR = [r + s for r in RANKS for s in SUITS]
 
-def create_deck() -> List[str]:
+
+def card_names(cards: Iterable[int]) -> List[str]:
+    """Names of cards, e.g. [50, 45] -> ["Ah", "Jh"]; for display only."""
+    return [_CARD_STR[c] for c in cards]
+
+
+def _hole_strength(c1: int, c2: int) -> float:
+    """Rough 0-1 rating of two hole cards, used by the bots."""
+    i1, s1 = c1 >> 2, c1 & 3
+    i2, s2 = c2 >> 2, c2 & 3
+
+    base = max(i1, i2) / (len(RANKS) - 1)
+    if i1 == i2:
+        base += 0.4
+    if s1 == s2:
+        base += 0.1
+    if abs(i1 - i2) == 1:
+        base += 0.05
+    return max(0.0, min(1.0, base))
+
+
+# _hole_strength of every pair of cards: _HOLE_STRENGTH[c1][c2]
+_HOLE_STRENGTH = [[_hole_strength(c1, c2) for c2 in range(52)] for c1 in range(52)]
+
+
+def create_deck(rng: Optional[random.Random] = None) -> bytearray:
     """Create and shuffle a standard 52-card deck."""
-    deck = [r + s for r in RANKS for s in SUITS]
-    random.shuffle(deck)
+    deck = bytearray(range(52))
+    (rng or random).shuffle(deck)
     return deck
 
 
 # ---------- BOT PERSONALITIES ----------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BotProfile:
     name: str
     looseness: float   # 0 = very tight, 1 = very loose
     aggression: float  # 0 = passive, 1 = maniac
     bluffiness: float  # 0 = never bluff, 1 = bluffs a lot
+    # (looseness, aggression) per mood, adjusted for the mood and clamped to 0-1
+    by_mood: Dict[str, Tuple[float, float]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        by_mood = {}
+        for mood in ("neutral", "heater", "tilt"):
+            looseness = self.looseness
+            aggression = self.aggression
+
+            if mood == "heater":
+                looseness += 0.1
+                aggression += 0.1
+            elif mood == "tilt":
+                if self.aggression > 0.5:
+                    aggression += 0.1
+                else:
+                    looseness -= 0.1
+
+            by_mood[mood] = (max(0.0, min(1.0, looseness)), max(0.0, min(1.0, aggression)))
+        object.__setattr__(self, "by_mood", by_mood)
 
 
 BOT_PROFILES: Dict[str, BotProfile] = {
@@ -36,17 +84,20 @@ BOT_PROFILES: Dict[str, BotProfile] = {
     "Gambler Grace": BotProfile("Gambler Grace", looseness=0.80, aggression=0.70, bluffiness=0.60),
 }
 
+# Used for bots whose name has no profile
+DEFAULT_PROFILE = BotProfile("Default", 0.4, 0.5, 0.2)
+
 
 # ---------- Data Structures ----------
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     id: int
     name: str
     is_human: bool
     stack: int
     seat: int
-    hole_cards: List[str] = field(default_factory=list)
+    hole_cards: bytearray = field(default_factory=bytearray)  # card ints, as dealt
     in_hand: bool = True
     has_folded: bool = False
     has_all_in: bool = False
@@ -55,13 +106,12 @@ class Player:
 
     starting_stack: int = 1000
     mood: str = "neutral"  # "neutral" | "heater" | "tilt"
-
-    @property
-    def profile(self) -> Optional[BotProfile]:
-        return BOT_PROFILES.get(self.name)
+    profile: Optional[BotProfile] = None  # BOT_PROFILES entry for the name, if any
+    hand_strength: float = 0.0  # of the hole cards, set when they are dealt
 
     def reset_for_new_hand(self):
-        self.hole_cards = []
+        self.hole_cards = bytearray()
+        self.hand_strength = 0.0
         self.in_hand = self.stack > 0
         self.has_folded = False
         self.has_all_in = False
@@ -69,22 +119,22 @@ class Player:
         self.total_contribution = 0
 
 
-@dataclass
-class Action:
+class Action(NamedTuple):
     player_id: int
     action_type: str  # "fold" | "check" | "call" | "bet" | "raise" | "all-in"
     amount: int       # amount put in NOW (not total)
     street: str       # "preflop" | "flop" | "turn" | "river"
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[Player]
     small_blind_amount: int
     big_blind_amount: int
 
-    deck: List[str] = field(default_factory=list)
-    community_cards: List[str] = field(default_factory=list)
+    deck: bytearray = field(default_factory=bytearray)
+    deck_top: int = 0  # deck[:deck_top] is undealt; the top card is deck[deck_top - 1]
+    community_cards: bytearray = field(default_factory=bytearray)
     pot: int = 0
     button_seat: int = 0
     current_bet: int = 0  # highest bet amount this street
@@ -92,15 +142,37 @@ class GameState:
     betting_round: str = "preflop"  # preflop, flop, turn, river, finished
     action_history: List[Action] = field(default_factory=list)
     current_player_seat: Optional[int] = None
+    # Bit (1 << seat) set for every player still in the hand (not folded)
+    active_mask: int = 0
+    # seat_players[seat] is the player at that seat (None for an empty seat);
+    # players don't change seats during a game
+    seat_players: Tuple[Optional[Player], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        seat_players: List[Optional[Player]] = [None] * (max(p.seat for p in self.players) + 1)
+        for p in self.players:
+            seat_players[p.seat] = p
+        self.seat_players = tuple(seat_players)
+
+    @property
+    def num_active(self) -> int:
+        """Players still in the hand; len(active_players()) without the list."""
+        return self.active_mask.bit_count()
 
     def active_players(self) -> List[Player]:
         return [p for p in self.players if p.in_hand and not p.has_folded]
 
-    def player_by_seat(self, seat: int) -> Player:
+    def reset_active_mask(self):
+        self.active_mask = 0
         for p in self.players:
-            if p.seat == seat:
-                return p
-        raise ValueError(f"No player at seat {seat}")
+            if p.in_hand and not p.has_folded:
+                self.active_mask |= 1 << p.seat
+
+    def player_by_seat(self, seat: int) -> Player:
+        player = self.seat_players[seat] if 0 <= seat < len(self.seat_players) else None
+        if player is None:
+            raise ValueError(f"No player at seat {seat}")
+        return player
 
 
 # ---------- Poker Game Engine (web-friendly) ----------
@@ -112,12 +184,15 @@ class PokerGame:
     """
 
     def __init__(self, player_names: List[str], starting_stack: int = 1000,
-                 small_blind: int = 5, big_blind: int = 10):
+                 small_blind: int = 5, big_blind: int = 10, seed: Optional[int] = None):
         if not 2 <= len(player_names) <= 8:
             raise ValueError("Game supports 2 to 8 players.")
 
+        # Each game draws from its own generator (seed it for a replayable game)
+        self._rng = random.Random(seed)
+
         seats = list(range(len(player_names)))
-        random.shuffle(seats)
+        self._rng.shuffle(seats)
 
         players: List[Player] = []
         for i, name in enumerate(player_names):
@@ -129,6 +204,7 @@ class PokerGame:
                     stack=starting_stack,
                     seat=seats[i],
                     starting_stack=starting_stack,
+                    profile=BOT_PROFILES.get(name),
                 )
             )
 
@@ -137,11 +213,17 @@ class PokerGame:
             small_blind_amount=small_blind,
             big_blind_amount=big_blind,
         )
-        self.state.button_seat = random.choice(seats)
+        self.state.button_seat = self._rng.choice(seats)
+        self.state.reset_active_mask()
 
         self.last_event: str = "Game created."
         self.last_winner: Optional[str] = None
 
+        # Bumped on every change to the game, so the UI layer can reuse
+        # whatever it derived from an unchanged game
+        self.state_version: int = 0
+        self._blind_seats: Optional[Tuple[int, int]] = None
+
     # ----- Handy properties for UI -----
 
     @property
@@ -151,11 +233,14 @@ class PokerGame:
     def blind_seats(self) -> Tuple[int, int]:
         """
         Return (small_blind_seat, big_blind_seat) for display.
+        Computed once per state_version.
         """
-        s = self.state
-        sb_seat = self._next_occupied_seat(s.button_seat)
-        bb_seat = self._next_occupied_seat(sb_seat)
-        return sb_seat, bb_seat
+        if self._blind_seats is None:
+            s = self.state
+            sb_seat = self._next_occupied_seat(s.button_seat)
+            bb_seat = self._next_occupied_seat(sb_seat)
+            self._blind_seats = (sb_seat, bb_seat)
+        return self._blind_seats
 
     def total_chips(self) -> int:
         """
@@ -165,28 +250,40 @@ class PokerGame:
 
     # ----- Public API called from UI -----
 
+    def mark_changed(self):
+        """Record a change to the game; call after editing state from outside."""
+        self.state_version += 1
+        self._blind_seats = None
+
     def start_new_hand(self):
         """Reset state and deal a new hand."""
-        s = self.state
-        for p in s.players:
-            p.reset_for_new_hand()
+        try:
+            s = self.state
+            for p in s.players:
+                p.reset_for_new_hand()
+            s.reset_active_mask()
 
-        s.deck = create_deck()
-        s.community_cards = []
-        s.pot = 0
-        s.current_bet = 0
-        s.last_raiser_seat = None
-        s.betting_round = "preflop"
-        s.action_history = []
-        self.last_winner = None
+            s.deck = create_deck(self._rng)
+            s.deck_top = len(s.deck)
+            s.community_cards = bytearray()
+            s.pot = 0
+            s.current_bet = 0
+            s.last_raiser_seat = None
+            s.betting_round = "preflop"
+            s.action_history = []
+            self.last_winner = None
 
-        # Move button
-        self._advance_button()
-        # Post blinds + deal
-        self._post_blinds()
-        self._deal_hole_cards()
+            # Move button
+            self._advance_button()
+            # Post blinds + deal
+            self._post_blinds()
+            self._deal_hole_cards()
 
-        self.last_event = "New hand started."
+            self.last_event = "New hand started."
+        finally:
+            # After the changes, so nothing derived from a half-updated
+            # state gets cached under the new version
+            self.mark_changed()
 
     def run_street_with_human_choice(self, human_choice: str, human_amount: Optional[int] = None):
         """
@@ -196,58 +293,68 @@ class PokerGame:
         We loop around the table once (simple model), then either
         go to next street or finish the hand.
         """
-        s = self.state
-
-        if s.betting_round == "finished":
-            self.last_event = "Hand already finished. Start a new hand."
-            return
-
-        street_before = s.betting_round
-
-        # Reset street contributions (blinds are already in total_contribution/pot)
-        self._reset_street_for_players()
-
-        active_players = [p for p in s.players if p.in_hand and not p.has_folded]
-        if len(active_players) <= 1:
-            self._handle_showdown_or_win()
-            s.betting_round = "finished"
-            return
-
-        active_seats = sorted({p.seat for p in active_players})
-        if s.current_player_seat in active_seats:
-            start_index = active_seats.index(s.current_player_seat)
-        else:
-            start_index = 0
-        ordered_seats = active_seats[start_index:] + active_seats[:start_index]
-
-        for seat in ordered_seats:
-            player = s.player_by_seat(seat)
-            if not player.in_hand or player.has_folded or player.has_all_in:
-                continue
-
-            if player.is_human:
-                action_type, amount = self._human_choice_to_action(player, human_choice, human_amount)
+        try:
+            s = self.state
+
+            if s.betting_round == "finished":
+                self.last_event = "Hand already finished. Start a new hand."
+                return
+
+            street_before = s.betting_round
+
+            # Reset street contributions (blinds are already in total_contribution/pot)
+            self._reset_street_for_players()
+
+            if s.num_active <= 1:
+                self._handle_showdown_or_win()
+                s.betting_round = "finished"
+                return
+
+            # Seats active at the start of the street, in acting order: from the
+            # current player's seat upwards, then wrapping around to the lowest
+            seats = s.active_mask
+            start = s.current_player_seat
+            if start is None or not seats >> start & 1:
+                start = 0
+            later = seats >> start << start
+            wrapped = seats ^ later
+
+            # The bots act in runs before and after the human's turn
+            human = next((p for p in s.players if p.is_human), None)
+            human_bit = 1 << human.seat if human is not None else 0
+            for run in (later, wrapped):
+                if not run & human_bit:
+                    if not self._run_bot_street(run):
+                        break
+                    continue
+                if not self._run_bot_street(run & (human_bit - 1)):
+                    break
+                if not human.has_all_in:
+                    action_type, amount = self._human_choice_to_action(human, human_choice, human_amount)
+                    self._apply_action(human, action_type, amount)
+                    if s.num_active <= 1:
+                        break
+                if not self._run_bot_street(run >> human.seat + 1 << human.seat + 1):
+                    break
+
+            if s.num_active <= 1 or s.betting_round == "river":
+                self._handle_showdown_or_win()
+                s.betting_round = "finished"
             else:
-                action_type, amount = self._bot_decision(player)
-
-            self._apply_action(player, action_type, amount)
-
-        active_after = s.active_players()
-        if len(active_after) <= 1 or s.betting_round == "river":
-            self._handle_showdown_or_win()
-            s.betting_round = "finished"
-        else:
-            if s.betting_round == "preflop":
-                self._deal_flop()
-                s.betting_round = "flop"
-            elif s.betting_round == "flop":
-                self._deal_turn()
-                s.betting_round = "turn"
-            elif s.betting_round == "turn":
-                self._deal_river()
-                s.betting_round = "river"
-
-        self.last_event = f"On {street_before.upper()}, you chose {human_choice.replace('_', '/').upper()}."
+                if s.betting_round == "preflop":
+                    self._deal_flop()
+                    s.betting_round = "flop"
+                elif s.betting_round == "flop":
+                    self._deal_turn()
+                    s.betting_round = "turn"
+                elif s.betting_round == "turn":
+                    self._deal_river()
+                    s.betting_round = "river"
+
+            self.last_event = f"On {street_before.upper()}, you chose {human_choice.replace('_', '/').upper()}."
+        finally:
+            # Also on the early returns above
+            self.mark_changed()
 
     # ----- Internal mechanics -----
 
@@ -292,23 +399,29 @@ class PokerGame:
         for _ in range(2):
             for p in s.players:
                 if p.stack > 0:
-                    card = s.deck.pop()
-                    p.hole_cards.append(card)
+                    s.deck_top -= 1
+                    p.hole_cards.append(s.deck[s.deck_top])
+        # Hole cards are fixed for the hand: rate them once
+        for p in s.players:
+            p.hand_strength = self._hand_strength(p)
 
-    def _deal_flop(self):
+    def _burn_and_deal(self, n: int):
+        """Burn the top card, then deal the next n to the board."""
         s = self.state
-        s.deck.pop()
-        s.community_cards.extend([s.deck.pop(), s.deck.pop(), s.deck.pop()])
+        top = s.deck_top - 1
+        if top < n:
+            raise IndexError("Not enough cards left in the deck.")
+        s.community_cards += s.deck[top - n:top][::-1]
+        s.deck_top = top - n
+
+    def _deal_flop(self):
+        self._burn_and_deal(3)
 
     def _deal_turn(self):
-        s = self.state
-        s.deck.pop()
-        s.community_cards.append(s.deck.pop())
+        self._burn_and_deal(1)
 
     def _deal_river(self):
-        s = self.state
-        s.deck.pop()
-        s.community_cards.append(s.deck.pop())
+        self._burn_and_deal(1)
 
     def _first_to_act_preflop(self) -> int:
         s = self.state
@@ -319,6 +432,25 @@ class PokerGame:
         s = self.state
         return self._next_occupied_seat(s.button_seat)
 
+    def _run_bot_street(self, seats: int) -> bool:
+        """
+        Let the bots at seats (a bitmask) act, lowest seat first.
+        Returns False once everyone else has folded and the hand is over.
+        """
+        s = self.state
+        seat_players = s.seat_players
+        while seats:
+            player = seat_players[(seats & -seats).bit_length() - 1]
+            seats &= seats - 1
+            if not player.in_hand or player.has_folded or player.has_all_in:
+                continue
+
+            action_type, amount = self._bot_decision(player)
+            self._apply_action(player, action_type, amount)
+            if s.num_active <= 1:
+                return False
+        return True
+
     def _reset_street_for_players(self):
         s = self.state
         for p in s.players:
@@ -337,6 +469,7 @@ class PokerGame:
         if action_type == "fold":
             player.has_folded = True
             player.in_hand = False
+            s.active_mask &= ~(1 << player.seat)
             self._record_action(player, "fold", 0, s.betting_round)
             return
 
@@ -363,25 +496,20 @@ class PokerGame:
             player.has_all_in = True
 
     def _record_action(self, player: Player, action_type: str, amount: int, street: str):
-        self.state.action_history.append(
-            Action(
-                player_id=player.id,
-                action_type=action_type,
-                amount=amount,
-                street=street,
-            )
-        )
+        self.state.action_history.append(Action(player.id, action_type, amount, street))
 
     def _next_occupied_seat(self, seat: int) -> int:
-        s = self.state
-        active_seats = sorted({p.seat for p in s.players if p.in_hand and not p.has_folded})
-        if not active_seats:
+        """Next active seat clockwise from seat; the lowest one if seat isn't active."""
+        mask = self.state.active_mask
+        if not mask:
             raise RuntimeError("No active players remaining.")
-        if seat not in active_seats:
-            return active_seats[0]
-        idx = active_seats.index(seat)
-        next_idx = (idx + 1) % len(active_seats)
-        return active_seats[next_idx]
+        if mask >> seat & 1:
+            # Drop seat and everything below it; wrap around if nothing is left
+            later = mask >> (seat + 1) << (seat + 1)
+            if later:
+                mask = later
+        # Lowest set bit
+        return (mask & -mask).bit_length() - 1
 
     def _find_big_blind_seat(self) -> int:
         s = self.state
@@ -403,7 +531,7 @@ class PokerGame:
             return
 
         # TODO: plug in real hand evaluation.
-        winner = random.choice(active)
+        winner = active[self._rng.randrange(len(active))]
         winner.stack += s.pot
         s.pot = 0
         self.last_winner = winner.name
@@ -414,19 +542,7 @@ class PokerGame:
         if len(player.hole_cards) < 2:
             return 0.0
         c1, c2 = player.hole_cards
-        r1, s1 = c1[0], c1[1]
-        r2, s2 = c2[0], c2[1]
-
-        i1 = RANKS.index(r1)
-        i2 = RANKS.index(r2)
-        base = max(i1, i2) / (len(RANKS) - 1)
-        if r1 == r2:
-            base += 0.4
-        if s1 == s2:
-            base += 0.1
-        if abs(i1 - i2) == 1:
-            base += 0.05
-        return max(0.0, min(1.0, base))
+        return _HOLE_STRENGTH[c1][c2]
 
     def _human_choice_to_action(self, player: Player, choice: str,
                                 human_amount: Optional[int]) -> Tuple[str, int]:
@@ -470,7 +586,8 @@ class PokerGame:
 
     def _bot_decision(self, player: Player) -> Tuple[str, int]:
         s = self.state
-        profile = player.profile or BotProfile("Default", 0.4, 0.5, 0.2)
+        rng = self._rng
+        profile = player.profile or DEFAULT_PROFILE
 
         ratio = player.stack / player.starting_stack if player.starting_stack > 0 else 1.0
         if ratio >= 1.5:
@@ -480,35 +597,26 @@ class PokerGame:
         else:
             player.mood = "neutral"
 
-        looseness = profile.looseness
-        aggression = profile.aggression
+        looseness, aggression = profile.by_mood[player.mood]
         bluffiness = profile.bluffiness
 
-        if player.mood == "heater":
-            looseness += 0.1
-            aggression += 0.1
-        elif player.mood == "tilt":
-            if profile.aggression > 0.5:
-                aggression += 0.1
-            else:
-                looseness -= 0.1
-
-        looseness = max(0.0, min(1.0, looseness))
-        aggression = max(0.0, min(1.0, aggression))
-
         can_check = (s.current_bet == player.contribution_this_round)
         to_call = max(0, s.current_bet - player.contribution_this_round)
-        strength = self._hand_strength(player)
+        strength = player.hand_strength
         desire = strength * 0.7 + looseness * 0.3
 
         if player.stack <= 0:
             return "check", 0
 
+        # Each decision draws one uniform and compares it with cumulative
+        # action probabilities
+
         if can_check:
-            if desire < 0.2 and random.random() > looseness:
-                return "check", 0
-            bet_tendency = aggression * 0.6 + strength * 0.4
-            if random.random() < bet_tendency:
+            bet_chance = aggression * 0.6 + strength * 0.4
+            if desire < 0.2:
+                # Weak hands only consider betting when loose enough
+                bet_chance *= looseness
+            if rng.random() < bet_chance:
                 base = max(s.big_blind_amount, int((s.pot + s.big_blind_amount) * 0.6))
                 bet_size = min(base, int(player.stack * 0.6))
                 bet_size = max(s.big_blind_amount, bet_size)
@@ -520,12 +628,15 @@ class PokerGame:
 
         pot_odds = to_call / (s.pot + to_call) if (s.pot + to_call) > 0 else 0.0
 
-        if desire + 0.1 < pot_odds and random.random() > looseness:
-            return "fold", 0
+        # Bad price: fold unless loose enough to continue
+        fold_chance = 1.0 - looseness if desire + 0.1 < pot_odds else 0.0
+        raise_chance = (1.0 - fold_chance) * aggression * (strength + bluffiness) / 2.0
 
-        raise_tendency = aggression * (strength + bluffiness) / 2.0
-        if random.random() < raise_tendency:
-            mult = random.uniform(2.0, 4.0)
+        u = rng.random()
+        if u < fold_chance:
+            return "fold", 0
+        if u < fold_chance + raise_chance:
+            mult = rng.uniform(2.0, 4.0)
             raise_size = int(to_call * mult)
             raise_size = min(raise_size, player.stack)
             if raise_size <= to_call:
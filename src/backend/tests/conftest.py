@@ -0,0 +1,9 @@
+"""
+Tests for the backend modules. Run from src/backend with: python -m pytest tests
+"""
+
+import os
+import sys
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,122 @@
+"""
+Hand tables and the coach's hand classification against a brute-force
+evaluator: the best of all 5-card subsets, scored from scratch.
+"""
+
+import os
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+import hand_tables
+from hand_tables import CATEGORY_NAMES, FLUSH_RANK, PRIMES, RANK_CATEGORY, unsuited_rank
+from poker_coach import PokerCoach
+
+# Cards are ints 0..51: rank << 2 | suit
+NUM_HANDS = 5000
+
+
+def _score5(cards):
+    """(category, tie-breaking ranks...) of a 5-card hand; higher is better"""
+    ranks = [c >> 2 for c in cards]
+    # Ranks by count, then by rank: e.g. a full house is (trips rank, pair rank)
+    groups = sorted(Counter(ranks).items(), key=lambda rc: (rc[1], rc[0]), reverse=True)
+    shape = [n for _, n in groups]
+    order = tuple(r for r, _ in groups)
+    flush = len({c & 3 for c in cards}) == 1
+
+    straight_high = None
+    if len(groups) == 5:
+        if order[0] - order[4] == 4:
+            straight_high = order[0]
+        elif order == (12, 3, 2, 1, 0):  # wheel, five high
+            straight_high = 3
+
+    if straight_high is not None:
+        return (8 if flush else 4, straight_high)
+    if shape == [4, 1]:
+        category = 7
+    elif shape == [3, 2]:
+        category = 6
+    elif flush:
+        category = 5
+    elif shape == [3, 1, 1]:
+        category = 3
+    elif shape == [2, 2, 1]:
+        category = 2
+    elif shape == [2, 1, 1, 1]:
+        category = 1
+    else:
+        category = 0
+    return (category,) + order
+
+
+def _best_score(cards):
+    return max(_score5(hand) for hand in combinations(cards, 5))
+
+
+def _table_rank(cards):
+    """Rank (1 = best) of 5-7 cards from the hand tables"""
+    for suit in range(4):
+        mask = 0
+        for c in cards:
+            if c & 3 == suit:
+                mask |= 1 << (c >> 2)
+        if mask.bit_count() >= 5:
+            return int(FLUSH_RANK[mask])
+    product = 1
+    for c in cards:
+        product *= PRIMES[c >> 2]
+    return unsuited_rank(product)
+
+
+def _random_hands(seed):
+    """Pairs of 7-card hands sharing a 5-card board"""
+    rng = random.Random(seed)
+    for _ in range(NUM_HANDS):
+        cards = rng.sample(range(52), 9)
+        board = cards[4:]
+        yield cards[:2] + board, cards[2:4] + board
+
+
+def test_table_rank_matches_brute_force():
+    for a, b in _random_hands(1):
+        rank_a, rank_b = _table_rank(a), _table_rank(b)
+        best_a, best_b = _best_score(a), _best_score(b)
+        assert RANK_CATEGORY[rank_a] == best_a[0], a
+        # Lower rank is better
+        assert (rank_a < rank_b) == (best_a > best_b), (a, b)
+        assert (rank_a == rank_b) == (best_a == best_b), (a, b)
+
+
+def test_analyze_postflop_hand_category():
+    coach = PokerCoach()
+    rng = random.Random(2)
+    for _ in range(NUM_HANDS):
+        cards = rng.sample(range(52), rng.choice((5, 6, 7)))
+        analysis = coach._analyze_postflop_hand(cards[:2], cards[2:])
+        assert analysis["made_hand"] == CATEGORY_NAMES[_best_score(cards)[0]], cards
+
+
+def test_shipped_tables_match_build():
+    np = pytest.importorskip("numpy")
+    flush_rank, unsuited, category, primary = hand_tables._build_tables()
+    keys = sorted(unsuited)
+
+    def load(name):
+        return np.load(os.path.join(hand_tables.TABLE_DIR, name + ".npy"))
+
+    assert load("flush_rank").tolist() == flush_rank
+    assert load("unsuited_keys").tolist() == keys
+    assert load("unsuited_ranks").tolist() == [unsuited[k] for k in keys]
+    assert load("rank_info").tolist() == [list(category), list(primary)]
+
+
+def test_unsuited_rank_rejects_unknown_products():
+    # 8-9-J: three ranks are not a hand
+    with pytest.raises(KeyError):
+        unsuited_rank(PRIMES[6] * PRIMES[7] * PRIMES[9])
+    with pytest.raises(KeyError):
+        unsuited_rank(PRIMES[12] ** 8)
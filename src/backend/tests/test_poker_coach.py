@@ -0,0 +1,16 @@
+"""
+Advice for situations the coach can't rate.
+"""
+
+from poker_coach import get_poker_advice
+
+
+def test_postflop_without_hole_cards():
+    # A hero all-in on the blind stays in the hand but gets no hole cards
+    advice = get_poker_advice([], ["8s", "9h", "Jd"], 100, 0, 0, 0, "BTN", "flop", 2)
+    assert advice.reasoning == "Invalid hand"
+
+
+def test_postflop_without_a_flop():
+    advice = get_poker_advice(["Ah", "Kd"], ["8s"], 100, 0, 0, 1000, "BTN", "flop", 2)
+    assert advice.reasoning == "Invalid hand"
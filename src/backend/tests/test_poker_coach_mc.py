@@ -0,0 +1,55 @@
+"""
+The Numba and NumPy equity kernels: they must rank hands like hand_tables
+and give the same equity.
+"""
+
+import numpy as np
+import pytest
+
+from hand_tables import FLUSH_RANK, PRIMES, unsuited_rank
+from poker_coach_mc import _TABLES, _eval7_batch, _equity, _equity_numpy, estimate_equity, eval7
+
+# Card ints: rank << 2 | suit, with rank 12 = ace
+ACES = np.array([12 << 2 | 0, 12 << 2 | 1], dtype=np.int64)
+NO_BOARD = np.empty(0, dtype=np.int64)
+
+
+def _table_rank(cards):
+    for suit in range(4):
+        mask = sum(1 << (c >> 2) for c in cards if c & 3 == suit)
+        if mask.bit_count() >= 5:
+            return int(FLUSH_RANK[mask])
+    product = 1
+    for c in cards:
+        product *= PRIMES[c >> 2]
+    return unsuited_rank(product)
+
+
+def test_eval7_matches_batch():
+    rng = np.random.default_rng(1)
+    hands = np.array([rng.choice(52, 7, replace=False) for _ in range(5000)], dtype=np.int64)
+    batch = _eval7_batch(hands)
+    for hand, score in zip(hands, batch):
+        assert eval7(hand, _TABLES) == score == _table_rank(hand.tolist()), hand.tolist()
+
+
+def _numba_equity(*args):
+    return _equity(*args, _TABLES)
+
+
+@pytest.mark.parametrize("equity", [_numba_equity, _equity_numpy], ids=["numba", "numpy"])
+def test_aces_against_one_hand(equity):
+    # Pocket aces win about 85% against a random hand
+    assert equity(ACES, NO_BOARD, 1, 4000, 7) == pytest.approx(0.85, abs=0.02)
+
+
+def test_equity_is_reproducible_with_a_seed():
+    board = np.array([0, 17, 33], dtype=np.int64)
+    for equity in (_numba_equity, _equity_numpy):
+        assert equity(ACES, board, 2, 500, 3) == equity(ACES, board, 2, 500, 3)
+
+
+@pytest.mark.parametrize("hero, board", [([], []), ([48], [0, 17, 33]), ([48, 49], list(range(6)))])
+def test_estimate_equity_rejects_bad_hands(hero, board):
+    with pytest.raises(ValueError):
+        estimate_equity(hero, board, 1)
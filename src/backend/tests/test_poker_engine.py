@@ -0,0 +1,133 @@
+"""
+Betting order, dealing and chip bookkeeping of PokerGame on seeded games.
+"""
+
+import random
+
+import pytest
+
+from poker_engine import PokerGame
+
+NAMES = ["HUMAN", "Crusher Carl", "LAG Lucy", "Nit Neil", "Station Sam", "Balanced Ben"]
+
+
+def _new_hand(seed=1):
+    game = PokerGame(NAMES, seed=seed)
+    game.start_new_hand()
+    return game
+
+
+def _play_street(game, first_seat, human_choice="check_call", bot_actions=None):
+    """
+    Run one street starting at first_seat, with each bot checking unless
+    bot_actions maps its seat to an action. Returns the seats in the order
+    they acted.
+    """
+    game._first_to_act_preflop = game._first_to_act_postflop = lambda: first_seat
+    game._bot_decision = lambda player: (bot_actions or {}).get(player.seat, ("check", 0))
+    already = len(game.state.action_history)
+    game.run_street_with_human_choice(human_choice)
+    seat_of = {p.id: p.seat for p in game.state.players}
+    return [seat_of[a.player_id] for a in game.state.action_history[already:]]
+
+
+@pytest.mark.parametrize("first_seat", range(len(NAMES)))
+def test_acting_order_rotates_from_current_player(first_seat):
+    # Covers the human acting first, last and in the middle of the bots
+    game = _new_hand()
+    n = len(NAMES)
+    assert _play_street(game, first_seat) == [(first_seat + i) % n for i in range(n)]
+
+
+def test_acting_order_skips_folded_players():
+    game = _new_hand()
+    human_seat = game.hero.seat
+    folder = (human_seat + 2) % len(NAMES)
+    _play_street(game, human_seat, bot_actions={folder: ("fold", 0)})
+
+    order = _play_street(game, human_seat)
+    assert folder not in order
+    assert sorted(order) == sorted(set(range(len(NAMES))) - {folder})
+
+
+def test_all_in_human_is_skipped():
+    game = _new_hand()
+    hero = game.hero
+    hero.stack = 0
+    hero.has_all_in = True
+
+    order = _play_street(game, hero.seat)
+    assert hero.seat not in order
+    assert len(order) == len(NAMES) - 1
+
+
+def test_street_stops_after_the_last_fold():
+    game = _new_hand()
+    hero = game.hero
+    n = len(NAMES)
+    # The human would act last, but every bot folds before that
+    first_seat = (hero.seat + 1) % n
+    folds = {seat: ("fold", 0) for seat in range(n) if seat != hero.seat}
+    chips = game.total_chips()
+
+    order = _play_street(game, first_seat, bot_actions=folds)
+    assert order == [(first_seat + i) % n for i in range(n - 1)]
+    assert game.state.betting_round == "finished"
+    assert game.last_winner == hero.name
+    assert hero.stack == chips - sum(p.stack for p in game.state.players if p is not hero)
+
+
+def test_next_occupied_seat():
+    game = _new_hand()
+    game.state.active_mask = 1 << 1 | 1 << 3 | 1 << 5
+    assert game._next_occupied_seat(1) == 3
+    assert game._next_occupied_seat(3) == 5
+    # Wraps around past the highest seat
+    assert game._next_occupied_seat(5) == 1
+    # A seat that isn't active gives the lowest active seat
+    assert game._next_occupied_seat(2) == 1
+    assert game._next_occupied_seat(0) == 1
+
+    game.state.active_mask = 0
+    with pytest.raises(RuntimeError):
+        game._next_occupied_seat(0)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chips_are_conserved(seed):
+    rng = random.Random(seed)
+    game = PokerGame(NAMES, seed=seed)
+    chips = game.total_chips()
+    for _ in range(30):
+        if sum(p.stack > 0 for p in game.state.players) < 2:
+            break
+        game.start_new_hand()
+        while game.state.betting_round != "finished":
+            game.run_street_with_human_choice(rng.choice(["fold", "check_call", "bet_raise"]))
+            assert game.total_chips() == chips
+        assert game.state.pot == 0
+
+
+def test_dealing_order():
+    game = PokerGame(NAMES, seed=3)
+    game.start_new_hand()
+    s = game.state
+
+    # Cards come off the end of the deck, hole cards one per player per round
+    deck = list(s.deck)
+    assert sorted(deck) == list(range(52))
+    holes = {p.id: [] for p in s.players}
+    for _ in range(2):
+        for p in s.players:
+            holes[p.id].append(deck.pop())
+    assert {p.id: list(p.hole_cards) for p in s.players} == holes
+    assert s.deck_top == len(deck)
+
+    # Each street burns one card, then deals
+    board = []
+    for deal, n in ((game._deal_flop, 3), (game._deal_turn, 1), (game._deal_river, 1)):
+        deck.pop()
+        board += [deck.pop() for _ in range(n)]
+        deal()
+        assert list(s.community_cards) == board
+        assert s.deck_top == len(deck)